@@ -15,7 +15,7 @@ export default function DashboardPage() {
           <div className="space-y-8">
             {/* Header */}
             <div>
-              <h1 className="text-3xl font-bold text-stone-900">Dashboard</h1>
+              <h1 data-testid="dashboard-heading" className="text-3xl font-bold text-stone-900">Dashboard</h1>
               <p className="text-stone-600 mt-2">
                 Welcome to Invoice Parser - Your document management hub
               </p>
@@ -118,7 +118,7 @@ export default function UploadPage() {
           <div className="max-w-3xl mx-auto space-y-6">
             {/* Header */}
             <div>
-              <h1 className="text-3xl font-bold text-stone-900">Upload Invoice</h1>
+              <h1 data-testid="upload-heading" className="text-3xl font-bold text-stone-900">Upload Invoice</h1>
               <p className="text-stone-600 mt-2">
                 Upload PDF or image files for automatic invoice extraction
               </p>
@@ -180,12 +180,13 @@ export default function UploadPage() {
                   <div className="bg-stone-100 rounded-lg p-4">
                     <div className="flex items-center justify-between">
                       <div>
-                        <p className="font-medium text-stone-900">{file.name}</p>
+                        <p className="font-medium text-stone-900" data-testid="selected-file-name">{file.name}</p>
                         <p className="text-sm text-stone-600">
                           {(file.size / 1024).toFixed(2)} KB
                         </p>
                       </div>
                       <Button
+                        data-testid="file-remove"
                         variant="ghost"
                         size="sm"
                         onClick={handleReset}
@@ -200,6 +201,7 @@ export default function UploadPage() {
                 {/* Action Buttons */}
                 <div className="flex gap-3">
                   <Button
+                    data-testid="upload-submit"
                     onClick={handleUpload}
                     disabled={!file || isUploading}
                     className="flex-1"
@@ -0,0 +1,52 @@
+"""Cached authenticated storage state for the unittest suites.
+
+The journey test only cares about what happens after login, so it should
+never pay for the login UI. This app has no auth backend — the login form
+just sets ``localStorage.isAuthenticated`` — so the fastest equivalent of
+an API login is injecting that flag directly. ``login_via_init_script``
+arms a context so every document starts authenticated; ``get_auth_state``
+uses it once per process to produce a reusable ``storage_state`` file for
+``browser.new_context(storage_state=...)``. Tests that exercise the login
+flow itself must not use either.
+"""
+
+import os
+import tempfile
+
+try:
+    from test import _browser
+except ImportError:
+    import _browser
+
+BASE_URL = os.environ.get("BASE_URL", "http://localhost:3000")
+
+_state_path = None
+
+
+def login_via_init_script(context):
+    """Arm a context so every new document starts authenticated.
+
+    Init scripts run before any page script, so the auth flag is present on
+    first paint — no form fill, no submit round-trip, no redirect render.
+    """
+    context.add_init_script("localStorage.setItem('isAuthenticated', 'true')")
+
+
+def get_auth_state():
+    """Build the authenticated storage state once and return its file path."""
+    global _state_path
+    if _state_path is None:
+        # Suffix with the xdist worker id so parallel workers never write
+        # the same state file.
+        worker = os.environ.get("PYTEST_XDIST_WORKER", "main")
+        path = os.path.join(tempfile.gettempdir(), f"frontinv-auth-{worker}.json")
+        ctx = _browser.new_context()
+        login_via_init_script(ctx)
+        page = ctx.new_page()
+        # One cheap navigation so the origin exists and the init script has
+        # somewhere to write; any route would do.
+        page.goto(f"{BASE_URL}/login", wait_until="domcontentloaded")
+        ctx.storage_state(path=path)
+        ctx.close()
+        _state_path = path
+    return _state_path
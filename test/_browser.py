@@ -0,0 +1,117 @@
+"""Process-wide Playwright browser singleton for the unittest suites.
+
+Chromium cold launch can take anywhere from ~500 ms to several seconds;
+launching per test class pays that cost once per file. The unittest
+classes instead share one lazily-launched browser per process via
+``get_browser()``; test classes create (and close) their own contexts and
+pages but must never close the browser itself — an atexit hook shuts it
+down when the process exits. Under pytest-xdist each worker process gets
+its own singleton, so the sync API is never shared across processes.
+"""
+
+import atexit
+import os
+from urllib.parse import urlparse
+
+from playwright.sync_api import sync_playwright
+
+SHOW_UI = os.environ.get("SHOW_UI", "0") == "1"
+# Headless runs use the headless-shell build: same engine, ~4x smaller
+# download and faster CI installs than full Chromium. Headed runs need the
+# full browser, so SHOW_UI ignores this.
+CHROMIUM_CHANNEL = os.environ.get("PW_CHROMIUM_CHANNEL", "chromium-headless-shell")
+# Trim Chromium startup and background work for headless CI runs: fewer
+# child processes (--no-zygote), no GPU init, no /dev/shm pressure in
+# containers, and none of the background services the tests never touch.
+HEADLESS_ARGS = [
+    "--no-sandbox",
+    "--disable-dev-shm-usage",
+    "--disable-gpu",
+    "--no-zygote",
+    "--disable-background-networking",
+    "--disable-background-timer-throttling",
+    "--disable-client-side-phishing-detection",
+    "--disable-features=TranslateUI",
+]
+# When set, attach to an already-running browser server (playwright
+# launch-server) over its WebSocket endpoint instead of launching: repeated
+# suite invocations then reuse one warm browser and pay only the ~connect
+# cost, and the launch/teardown disappears entirely.
+WS_ENDPOINT = os.environ.get("PW_WS_ENDPOINT", "")
+# Everything the tests assert lives on the app origin; fonts, analytics and
+# other third-party fetches only add latency and can hang navigations for
+# their full timeout when the external host is slow or unreachable.
+BASE_URL = os.environ.get("BASE_URL", "http://localhost:3000")
+_FIRST_PARTY_HOST = urlparse(BASE_URL).hostname
+# The suites assert DOM structure and navigation, never pixels, so images,
+# fonts and media are dead weight on every render. FULL_ASSETS=1 restores
+# them for headed debugging where the page should look real.
+FULL_ASSETS = os.environ.get("FULL_ASSETS", "") == "1"
+_ASSET_EXTENSIONS = (
+    ".png", ".jpg", ".jpeg", ".gif", ".webp", ".svg", ".ico",
+    ".woff", ".woff2", ".ttf", ".otf", ".mp4",
+)
+
+_driver = None
+_browser = None
+
+
+def get_browser():
+    """Return the shared Chromium instance, launching it on first use."""
+    global _driver, _browser
+    if _browser is None:
+        _driver = sync_playwright().start()
+        if WS_ENDPOINT:
+            _browser = _driver.chromium.connect(WS_ENDPOINT)
+        elif SHOW_UI:
+            _browser = _driver.chromium.launch(headless=False, slow_mo=500)  # slow_mo only when a human watches
+        else:
+            _browser = _driver.chromium.launch(channel=CHROMIUM_CHANNEL, headless=True, args=HEADLESS_ARGS)
+        atexit.register(_shutdown)
+    return _browser
+
+
+def _shutdown():
+    global _driver, _browser
+    if _browser is not None:
+        _browser.close()  # for WS_ENDPOINT this only disconnects; the server stays warm
+        _browser = None
+    if _driver is not None:
+        _driver.stop()
+        _driver = None
+
+
+def _is_third_party(url):
+    host = urlparse(url).hostname
+    return host is not None and host != _FIRST_PARTY_HOST
+
+
+def _is_static_asset(url):
+    return urlparse(url).path.lower().endswith(_ASSET_EXTENSIONS)
+
+
+def _filter_request(route):
+    url = route.request.url
+    if _is_third_party(url):
+        route.abort()
+    elif not FULL_ASSETS and _is_static_asset(url):
+        route.abort()
+    else:
+        route.continue_()
+
+
+def new_context(**kwargs):
+    """Create a context on the shared browser with request filtering applied.
+
+    Third-party requests are always aborted and static assets too unless
+    FULL_ASSETS=1; all unittest-suite contexts should come through here so
+    the rules apply uniformly. kwargs pass straight to Browser.new_context.
+    """
+    ctx = get_browser().new_context(**kwargs)
+    ctx.route("**/*", _filter_request)
+    # Anything still pending after 10s against a local frontend is broken;
+    # don't let unannotated calls inherit Playwright's 30s default. The
+    # known-slow upload wait keeps its own explicit timeout.
+    ctx.set_default_timeout(10000)
+    ctx.set_default_navigation_timeout(10000)
+    return ctx
@@ -0,0 +1,330 @@
+"""Shared pytest fixtures for the Playwright E2E suite.
+
+The suite is designed to run in parallel with pytest-xdist:
+
+    pytest -n auto test/
+
+pytest-xdist runs a full pytest session inside every worker process, so the
+session-scoped fixtures below automatically become per-worker: each worker
+owns its own Playwright driver and Chromium instance, and Playwright's sync
+API is never shared across processes.
+"""
+
+import json
+import os
+from dataclasses import dataclass
+from pathlib import Path
+
+import pytest
+from playwright.sync_api import Locator, sync_playwright
+
+BASE_URL = os.environ.get("BASE_URL", "http://localhost:3000")  # frontend under test
+SHOW_UI = os.environ.get("SHOW_UI", "0") == "1"  # run headed only on explicit opt-in
+
+# Chromium ships background features (translate, sync, networking predictor,
+# first-run setup) that burn CPU on every launch and navigation; none of them
+# matter to these tests, so switch them off for faster, leaner workers.
+LAUNCH_ARGS = [
+    "--disable-dev-shm-usage",  # /dev/shm is tiny and slow in CI containers
+    "--disable-extensions",
+    "--disable-background-networking",
+    "--disable-default-apps",
+    "--disable-sync",
+    "--disable-translate",
+    "--no-first-run",
+    "--disable-features=Translate,BackForwardCache,IsolateOrigins",
+]
+
+# Opt-in: reuse a warm Chromium profile between suite invocations so GPU and
+# service-worker caches survive, instead of cold-booting a blank profile.
+PERSISTENT_PROFILE = os.environ.get("PW_PERSISTENT_PROFILE", "") == "1"
+PROFILE_DIR = Path(__file__).parent / "fixtures" / ".profile"
+
+# Opt-in: share one Chromium across all xdist workers over CDP instead of
+# launching one per worker. Saves launch time x num_workers at the cost of a
+# single shared browser process.
+SHARED_BROWSER = os.environ.get("PW_SHARED_BROWSER", "") == "1"
+CDP_PORT = int(os.environ.get("PW_CDP_PORT", "9222"))
+
+# These tests assert DOM structure and navigation only; images, web fonts and
+# media are dead weight on every goto, so abort them at the network layer.
+BLOCKED_RESOURCE_TYPES = {"image", "font", "media"}
+
+
+def _block_heavy_resources(route):
+    if route.request.resource_type in BLOCKED_RESOURCE_TYPES:
+        route.abort()
+    else:
+        route.continue_()
+
+
+def pytest_configure(config):
+    """On the xdist controller, launch the single shared browser if requested.
+
+    Workers are recognisable by their ``workerinput`` attribute; only the
+    controller (or a plain non-xdist run) performs the launch.
+    """
+    # CI sanity check: with an empty browser cache the first launch silently
+    # downloads Chromium mid-run, which looks like a hung test. Warn up front
+    # so a broken cache key shows up in the run summary instead.
+    browsers_path = Path(
+        os.environ.get("PLAYWRIGHT_BROWSERS_PATH", Path.home() / ".cache" / "ms-playwright")
+    )
+    if not hasattr(config, "workerinput") and not browsers_path.exists():
+        import warnings
+
+        warnings.warn(
+            f"Playwright browser cache not found at {browsers_path}; "
+            "run 'playwright install chromium-headless-shell' (CI: check the cache step)",
+            stacklevel=1,
+        )
+    if SHARED_BROWSER and not hasattr(config, "workerinput"):
+        config._pw_shared_driver = sync_playwright().start()
+        config._pw_shared_browser = config._pw_shared_driver.chromium.launch(
+            headless=not SHOW_UI,
+            args=LAUNCH_ARGS + [f"--remote-debugging-port={CDP_PORT}"],
+            chromium_sandbox=False,
+        )
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_makereport(item, call):
+    """Capture a screenshot when a test using the page fixture fails.
+
+    Keeps diagnostics off the happy path entirely: green runs pay nothing.
+    """
+    outcome = yield
+    report = outcome.get_result()
+    # Expose the call-phase report to fixtures (the page fixture uses it to
+    # decide whether to persist the trace chunk on teardown).
+    setattr(item, "rep_" + report.when, report)
+    if report.when == "call" and report.failed:
+        page = item.funcargs.get("page")
+        if page is not None:
+            debug_dir = Path(__file__).parent / "fixtures" / "debug"
+            debug_dir.mkdir(parents=True, exist_ok=True)
+            # Suffix with the xdist worker id so parallel workers never race
+            # on the same artifact path.
+            worker = os.environ.get("PYTEST_XDIST_WORKER", "")
+            name = f"{item.name}-{worker}.png" if worker else f"{item.name}.png"
+            try:
+                page.screenshot(path=str(debug_dir / name))
+            except Exception:
+                pass  # never let diagnostics mask the real failure
+
+
+def pytest_unconfigure(config):
+    driver = getattr(config, "_pw_shared_driver", None)
+    if driver is not None:
+        config._pw_shared_browser.close()
+        driver.stop()
+
+
+@pytest.fixture(scope="session")
+def playwright_instance():
+    """Start the Playwright driver once per session (i.e. once per xdist worker)."""
+    p = sync_playwright().start()
+    yield p
+    p.stop()
+
+
+@pytest.fixture(scope="session")
+def browser(playwright_instance):
+    """Launch one Chromium per session; headed with slow_mo when SHOW_UI is set.
+
+    With PW_SHARED_BROWSER=1 the fixture instead attaches to the controller's
+    browser over CDP, so workers skip the launch entirely.
+    """
+    if SHARED_BROWSER:
+        browser = playwright_instance.chromium.connect_over_cdp(f"http://localhost:{CDP_PORT}")
+        yield browser
+        browser.close()  # disconnects from the shared browser; controller closes it
+        return
+    if SHOW_UI:
+        browser = playwright_instance.chromium.launch(headless=False, slow_mo=250, args=LAUNCH_ARGS)
+    else:
+        browser = playwright_instance.chromium.launch(headless=True, args=LAUNCH_ARGS, chromium_sandbox=False)
+    yield browser
+    browser.close()
+
+
+@pytest.fixture(scope="session")
+def auth_storage_state(browser, tmp_path_factory):
+    """Bootstrap the demo auth flag once and persist it as a storage state file.
+
+    Every context created from this state starts out authenticated, so tests
+    skip the per-test goto + localStorage.setItem prelude entirely.
+    """
+    state_path = tmp_path_factory.mktemp("auth") / "state.json"
+    ctx = browser.new_context()
+    page = ctx.new_page()
+    page.goto(BASE_URL)
+    page.evaluate("() => localStorage.setItem('isAuthenticated', 'true')")
+    ctx.storage_state(path=str(state_path))
+    ctx.close()
+    return str(state_path)
+
+
+@pytest.fixture(scope="session")
+def context(request, playwright_instance):
+    """One shared, pre-authenticated BrowserContext per session.
+
+    Creating a context costs ~200-500 ms; for tests that don't mutate auth
+    state a shared context with a per-test page is sufficient. Tests that
+    need true isolation (login flows) should use ``isolated_context``.
+
+    With PW_PERSISTENT_PROFILE=1 the context comes from
+    launch_persistent_context with a reusable on-disk profile, skipping the
+    blank-profile bootstrap on repeated suite invocations.
+    """
+    if PERSISTENT_PROFILE:
+        ctx = playwright_instance.chromium.launch_persistent_context(
+            user_data_dir=str(PROFILE_DIR),
+            headless=not SHOW_UI,
+            args=LAUNCH_ARGS + ["--no-sandbox", "--disable-gpu"],
+        )
+    else:
+        ctx = request.getfixturevalue("browser").new_context(
+            storage_state=request.getfixturevalue("auth_storage_state")
+        )
+    # Init scripts run before any page script in every new document, so the
+    # auth flag is guaranteed present on first goto — no bootstrap navigation,
+    # evaluate or reload round-trips per test, and no way for a test's storage
+    # mutations to leak an unauthenticated state into the next test.
+    ctx.add_init_script("window.localStorage.setItem('isAuthenticated', 'true')")
+    ctx.route("**/*", _block_heavy_resources)
+    # Tracing runs for the whole session; per-test chunks (see the page
+    # fixture) are only written to disk when a test fails, so green runs pay
+    # nothing beyond the incremental in-memory capture.
+    ctx.tracing.start(screenshots=True, snapshots=True)
+    yield ctx
+    ctx.tracing.stop()
+    ctx.close()
+
+
+@pytest.fixture
+def page(context, request):
+    """New page in the shared authenticated context.
+
+    Each test gets its own trace chunk; the chunk is persisted only when the
+    test failed. A trace already contains DOM snapshots and screenshots, so
+    failure diagnostics never need a blocking page.content() serialization.
+
+    localStorage is intentionally left alone on teardown — it carries the
+    shared context's auth state. Cookies are reset; sessionStorage is
+    per-page and dies with the page anyway.
+    """
+    context.tracing.start_chunk(title=request.node.name)
+    page = context.new_page()
+    yield page
+    page.close()
+    context.clear_cookies()
+    rep = getattr(request.node, "rep_call", None)
+    if rep is not None and rep.failed:
+        debug_dir = Path(__file__).parent / "fixtures" / "debug"
+        debug_dir.mkdir(parents=True, exist_ok=True)
+        worker = os.environ.get("PYTEST_XDIST_WORKER", "")
+        name = f"{request.node.name}-{worker}.zip" if worker else f"{request.node.name}.zip"
+        context.tracing.stop_chunk(path=str(debug_dir / name))
+    else:
+        context.tracing.stop_chunk()
+
+
+# Prebuilt /extract mock payloads shared by the mock_extract fixture; route
+# handlers can fire more than once per test, so serialize exactly once.
+_EXTRACT_SUCCESS_BODY = json.dumps({
+    "data": {
+        "InvoiceId": "FAKE-123",
+        "VendorName": "Mock Vendor",
+        "InvoiceTotal": 123.45,
+        "Items": [],
+    }
+}).encode()
+_EXTRACT_SUCCESS_HEADERS = {"Content-Type": "application/json"}
+_EXTRACT_ERROR_BODY = b"Internal Error"
+
+
+@pytest.fixture
+def mock_extract(context):
+    """Mock POST /extract at the context level, dispatched per test by header.
+
+    A single context.route registration replaces per-page route() calls;
+    tests pick their scenario with
+    page.set_extra_http_headers({"x-test-mode": "success" | "fail"}).
+    """
+
+    def dispatch(route, request):
+        mode = request.headers.get("x-test-mode", "passthrough")
+        if request.method == "POST" and mode == "success":
+            route.fulfill(status=200, body=_EXTRACT_SUCCESS_BODY, headers=_EXTRACT_SUCCESS_HEADERS)
+        elif request.method == "POST" and mode == "fail":
+            route.fulfill(status=500, body=_EXTRACT_ERROR_BODY)
+        else:
+            route.continue_()
+
+    context.route("**/extract", dispatch)
+    yield
+    context.unroute("**/extract", dispatch)
+
+
+@pytest.fixture
+def isolated_context(browser):
+    """Opt-in fresh context for tests that need real storage/cookie isolation."""
+    ctx = browser.new_context()
+    ctx.route("**/*", _block_heavy_resources)
+    yield ctx
+    ctx.close()
+
+
+@dataclass(frozen=True)
+class UploadPageRefs:
+    """Upload-page locators, constructed once per page.
+
+    Locator construction walks the selector parser every time; binding the
+    handful of locators the upload tests share up front keeps test bodies to
+    actions and assertions only.
+    """
+
+    heading: Locator
+    file_input: Locator
+    upload: Locator
+    remove: Locator
+    toast: Locator
+
+
+@pytest.fixture
+def upload_refs(page):
+    """Prebuilt locators for the upload page bound to this test's page."""
+    return UploadPageRefs(
+        heading=page.locator('[data-testid="upload-heading"]'),
+        file_input=page.locator('input[type="file"]'),
+        upload=page.locator('[data-testid="upload-submit"]'),
+        remove=page.locator('[data-testid="file-remove"]').first,
+        toast=page.locator('[data-sonner-toast]').first,
+    )
+
+
+@pytest.fixture(scope="session")
+def sample_pdf():
+    """In-memory sample PDF payload for set_input_files.
+
+    One shared buffer per session means no per-test disk read and no
+    fixture file to regenerate; Playwright marshals the bytes straight
+    from RAM over CDP.
+    """
+    return {
+        "name": "sample.pdf",
+        "mimeType": "application/pdf",
+        "buffer": b"%PDF-1.4\n" + b"0" * 1024,
+    }
+
+
+@pytest.fixture(scope="session")
+def bad_file():
+    """In-memory non-PDF payload for the invalid-file-type test."""
+    return {
+        "name": "bad.txt",
+        "mimeType": "text/plain",
+        "buffer": b"this is not a pdf",
+    }
+
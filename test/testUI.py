@@ -1,25 +1,22 @@
 import unittest
-from playwright.sync_api import sync_playwright
+
+try:
+    from test import _browser
+except ImportError:
+    import _browser  # direct execution from test/
 
 
 class TestInvParserUI(unittest.TestCase):
-    
-    @classmethod
-    def setUpClass(cls):
-        """Set up the browser once for all tests in this class."""
-        cls.playwright = sync_playwright().start()
-        cls.browser = cls.playwright.chromium.launch(headless=False)  # headless=False to see the browser
-        
-    
-    @classmethod
-    def tearDownClass(cls):
-        """Clean up after all tests are done."""
-        cls.browser.close()
-        cls.playwright.stop()
 
     def setUp(self):
-        """Set up before each test method."""
-        self.page = self.browser.new_page()
+        """Create a filtered context on the shared browser for each test."""
+        self.context = _browser.new_context()
+        self.page = self.context.new_page()
+
+    def tearDown(self):
+        """Close this test's context; the shared browser stays up."""
+        self.page.close()
+        self.context.close()
     
     def test_page_title(self):
         """Test that the page title is correct."""
@@ -11,202 +11,179 @@ This test covers a complete user journey:
 This is a realistic flow that a real user would perform.
 """
 
-import time
 # Import unittest module - Python's built-in testing framework
 import unittest
 # Import os module - for file path operations
 import os
-# Import Playwright's synchronous API and TimeoutError exception
-from playwright.sync_api import sync_playwright, TimeoutError as PlaywrightTimeoutError
-
-
-class TestUserJourney(unittest.TestCase):
-    """
-    Test the complete user journey from login to viewing invoice details.
-    This class inherits from unittest.TestCase to use unittest's testing features.
-    """
+# Import Playwright's TimeoutError exception
+from playwright.sync_api import TimeoutError as PlaywrightTimeoutError
+# Shared per-process browser singleton; works both as a package module
+# (pytest from the repo root) and when run directly from test/.
+try:
+    from test import _auth
+    from test import _browser
+    from test import _browser_pool
+except ImportError:
+    import _auth
+    import _browser
+    import _browser_pool
+
+# Read environment config once at import; these never change mid-session.
+SHOW_UI = os.environ.get("SHOW_UI", "0") == "1"
+BASE_URL = os.environ.get("BASE_URL", "http://localhost:3000")
+# Upload completion wait; raise via env for genuinely slow extraction backends
+# instead of letting every hung test burn two minutes.
+UPLOAD_TIMEOUT_MS = int(os.environ.get("UPLOAD_TIMEOUT_MS", "10000"))
+
+# Selectors shared across tests — hoisted so every call site reuses the same
+# string instead of rebuilding it inline, and there is one place to update
+# when the markup changes.
+DASHBOARD_HEADING = '[data-testid="dashboard-heading"]'  # dashboard h1
+UPLOAD_HEADING = '[data-testid="upload-heading"]'  # upload page h1
+NAV_UPLOAD_LINK = 'nav a[href="/upload"]'  # navbar link to upload
+NAV_INVOICES_LINK = 'nav a[href="/invoices"]'  # navbar link to invoices
+NAV_DASHBOARD_LINK = 'nav a[href="/dashboard"]'  # navbar link to dashboard
+FILE_INPUT = 'input[type="file"]'  # hidden file input on the upload page
+SELECTED_FILE_NAME = '[data-testid="selected-file-name"]'  # chosen-file label
+UPLOAD_SUBMIT = '[data-testid="upload-submit"]'  # main upload button
+TOAST = '[data-sonner-toast]'  # sonner toast container
+USERNAME_INPUT = 'input[id="username"]'  # login username field
+PASSWORD_INPUT = 'input[id="password"]'  # login password field
+SUBMIT_BUTTON = 'button[type="submit"]'  # login submit button
+
+
+class TestUserJourney(unittest.TestCase):  # test class for the full user journey
+    """Tests the flow: login -> upload -> view invoice; uses unittest.TestCase."""
 
     @classmethod
-    def setUpClass(cls):
-        """
-        Set up the browser once for all tests in this class.
-        This method runs ONCE before all test methods in this class.
-        @classmethod means it's a class method (not instance method).
-        """
-        # Start Playwright's synchronous API - this initializes Playwright
-        cls.playwright = sync_playwright().start()
-
-        # Launch a Chromium browser instance.
-        # If SHOW_UI=1 is set in the environment, run headful with a small slow_mo
-        show_ui = os.environ.get("SHOW_UI", "0") == "1"
-        if show_ui:
-            # headful and slower so you can visually follow the flow
-            cls.browser = cls.playwright.chromium.launch(headless=False, slow_mo=500)
+    def setUpClass(cls):  # run once before all tests in this class
+        cls.browser = _browser.get_browser()  # process-wide shared browser; never closed here
+        cls.base_url = BASE_URL  # frontend base URL, overridable via env
+        cls.sample_invoice_path = os.path.join(os.path.dirname(__file__), "fixtures", "sample.pdf")  # fixture path
+
+    def setUp(self):  # run before each test method
+        if self._testMethodName == "test_complete_user_journey":  # journey test doesn't test login
+            self.context = _browser.new_context(storage_state=_auth.get_auth_state())  # authenticated, third-party requests aborted
+            self._pooled = False  # dedicated context, closed in tearDown
+            self.page = self.context.new_page()  # fresh page, already logged in
+        else:  # login/guard tests need a genuinely clean slate
+            self.context = _browser_pool.acquire()  # check a pre-warmed context out of the pool
+            self._pooled = True  # pooled context, returned in tearDown
+            self.page = self.context.new_page()  # clean-slate page; the pool's init script wipes localStorage
+
+    def tearDown(self):  # run after each test method
+        self.page.close()  # close the page/tab
+        if self._pooled:
+            _browser_pool.release(self.context)  # return the context for the next test
+        else:
+            self.context.close()  # dedicated storage_state context dies with the test
+
+    def test_complete_user_journey(self):  # main end-to-end flow test
+        self.page.goto(f"{self.base_url}/dashboard")  # storage_state context is already authenticated
+
+        dashboard_heading = self.page.locator(DASHBOARD_HEADING)  # locate dashboard heading
+        dashboard_heading.wait_for(state="visible", timeout=3000)  # event-driven wait; raises if heading never shows
+
+        self.page.click(f"{NAV_UPLOAD_LINK} >> nth=0")  # click auto-waits for the link; no pre-check round-trip
+        self.page.wait_for_url("**/upload")  # context default (10s) fails fast enough
+
+        upload_heading = self.page.locator(UPLOAD_HEADING)  # locate upload heading
+        upload_heading.wait_for(state="visible", timeout=3000)  # event-driven wait; raises if heading never shows
+
+        if not os.path.exists(self.sample_invoice_path):  # if sample PDF missing
+            self.skipTest(f"Sample invoice file not found at {self.sample_invoice_path}")  # skip test
+
+        file_input = self.page.locator(FILE_INPUT)  # locate file input
+        self.assertTrue(file_input.count() > 0, "File input should exist")  # ensure input exists
+        file_input.set_input_files(self.sample_invoice_path)  # set file input to sample PDF
+
+        file_name_display = self.page.locator(SELECTED_FILE_NAME)  # attribute lookup, no text-node regex scan
+        try:
+            file_name_display.wait_for(state="visible", timeout=3000)  # returns as soon as the name renders
+        except PlaywrightTimeoutError:
+            pass  # tolerate UI delays showing filename
+
+        self.page.click(UPLOAD_SUBMIT)  # click auto-waits for actionability
+
+        # One browser-side predicate covers every terminal upload signal —
+        # invoice redirect, success text, or an error toast — so the worst
+        # case is a single timeout window instead of serial waits per signal.
+        upload_outcome = (
+            "() => /\\/invoice\\//.test(location.pathname)"
+            " || /successfully/i.test(document.body.innerText)"
+            " || !!document.querySelector('[data-sonner-toast]')"
+        )
+        try:
+            self.page.wait_for_function(upload_outcome, timeout=UPLOAD_TIMEOUT_MS)
+            outcome = self.page.evaluate(
+                "() => /\\/invoice\\//.test(location.pathname) ? 'redirected'"
+                " : /successfully/i.test(document.body.innerText) ? 'success'"
+                " : 'error'"
+            )  # classify the terminal signal in one round-trip
+        except PlaywrightTimeoutError:
+            outcome = "timeout"  # no terminal signal within the window
+
+        if outcome in ("redirected", "success"):
+            print(f"[OK] Upload completed ({outcome})")  # log success
+        elif outcome == "error":
+            print("[WARN] Upload failed (likely backend not configured) - but UI flow is correct")  # warn
         else:
-            cls.browser = cls.playwright.chromium.launch(headless=True)
-
-        # Store the base URL of the frontend application (local dev server)
-        """End-to-End Test: Complete User Journey - annotated per line."""  # module docstring
-
-        import time  # used for optional pauses when SHOW_UI is set
-        import unittest  # builtin test framework used here
-        import os  # used for env vars and path checks
-        from playwright.sync_api import sync_playwright, TimeoutError as PlaywrightTimeoutError  # Playwright sync API
-
-
-        class TestUserJourney(unittest.TestCase):  # test class for the full user journey
-            """Tests the flow: login -> upload -> view invoice; uses unittest.TestCase."""
-
-            @classmethod
-            def setUpClass(cls):  # run once before all tests in this class
-                cls.playwright = sync_playwright().start()  # start Playwright
-                show_ui = os.environ.get("SHOW_UI", "0") == "1"  # check headed toggle
-                if show_ui:
-                    cls.browser = cls.playwright.chromium.launch(headless=False, slow_mo=500)  # headed browser
-                else:
-                    cls.browser = cls.playwright.chromium.launch(headless=True)  # headless browser
-                cls.base_url = "http://localhost:3000"  # frontend base URL used by tests
-                cls.sample_invoice_path = os.path.join(os.path.dirname(__file__), "fixtures", "sample.pdf")  # fixture path
-
-            @classmethod
-            def tearDownClass(cls):  # run once after all tests in this class
-                cls.browser.close()  # close browser
-                cls.playwright.stop()  # stop Playwright
-
-            def setUp(self):  # run before each test method
-                self.page = self.browser.new_page()  # open new page/tab
-                self.page.goto(f"{self.base_url}/login")  # navigate to login page
-                self.page.evaluate("localStorage.clear()")  # clear localStorage for a fresh state
-
-            def tearDown(self):  # run after each test method
-                self.page.close()  # close the page/tab
-
-            def test_complete_user_journey(self):  # main end-to-end flow test
-                self.page.goto(f"{self.base_url}/login")  # ensure on login page
-                self.assertIn("login", self.page.url.lower())  # assert login in URL
-
-                username_input = self.page.locator('input[id="username"]')  # locate username input
-                password_input = self.page.locator('input[id="password"]')  # locate password input
-                submit_button = self.page.locator('button[type="submit"]')  # locate submit button
-
-                self.assertTrue(username_input.is_visible(), "Username input should be visible")  # visible check
-                self.assertTrue(password_input.is_visible(), "Password input should be visible")  # visible check
-                self.assertTrue(submit_button.is_visible(), "Submit button should be visible")  # visible check
-
-                username_input.fill("admin")  # fill username
-                password_input.fill("admin")  # fill password
-                submit_button.click()  # submit login form
-
-                self.page.wait_for_url("**/dashboard", timeout=5000)  # wait for dashboard redirect
-                self.assertIn("dashboard", self.page.url.lower())  # verify dashboard in URL
-
-                dashboard_heading = self.page.locator("h1:has-text('Dashboard')")  # locate dashboard heading
-                self.assertTrue(dashboard_heading.is_visible(timeout=3000), "Dashboard heading should be visible after login")  # check visibility
-
-                upload_link = self.page.locator('nav a[href="/upload"]').first  # locate upload link in nav
-                self.assertTrue(upload_link.is_visible(), "Upload link should be visible in navbar")  # ensure visible
-                upload_link.click()  # click upload link
-                self.page.wait_for_url("**/upload", timeout=5000)  # wait for upload page
-                self.assertIn("upload", self.page.url.lower())  # verify upload in URL
-
-                upload_heading = self.page.locator("h1:has-text('Upload Invoice')")  # locate upload heading
-                self.assertTrue(upload_heading.is_visible(timeout=3000), "Upload Invoice heading should be visible")  # check heading
-
-                if not os.path.exists(self.sample_invoice_path):  # if sample PDF missing
-                    self.skipTest(f"Sample invoice file not found at {self.sample_invoice_path}")  # skip test
-
-                file_input = self.page.locator('input[type="file"]')  # locate file input
-                self.assertTrue(file_input.count() > 0, "File input should exist")  # ensure input exists
-                file_input.set_input_files(self.sample_invoice_path)  # set file input to sample PDF
-
-                file_name_display = self.page.locator("text=/invoice.*\\.pdf/i")  # regex locator for displayed filename
-                try:
-                    self.assertTrue(file_name_display.is_visible(timeout=3000), "File name should be displayed after selection")  # check filename shown
-                except PlaywrightTimeoutError:
-                    pass  # tolerate UI delays showing filename
-
-                upload_button = self.page.locator('button:has-text("Upload & Extract")')  # locate upload button
-                self.assertTrue(upload_button.is_visible(), "Upload button should be visible")  # visible assertion
-                upload_button.click()  # click to upload
-
-                try:
-                    success_message = self.page.locator('text=/successfully/i')  # look for success text
-                    if success_message.is_visible(timeout=120000):  # wait up to 2 minutes for success
-                        self.assertTrue(True, "Upload completed successfully")  # success path
-                except PlaywrightTimeoutError:
-                    try:
-                        self.page.wait_for_url("**/invoice/**", timeout=120000)  # wait for invoice redirect
-                        self.assertIn("invoice", self.page.url.lower())  # confirm invoice in URL
-                        print("[OK] Redirected to invoice detail page after upload")  # log success
-                    except PlaywrightTimeoutError:
-                        error_message = self.page.locator('text=/error|unavailable|failed/i')  # locate error patterns
-                        if error_message.is_visible(timeout=2000):  # quick check for error text
-                            print("[WARN] Upload failed (likely backend not configured) - but UI flow is correct")  # warn
-                        else:
-                            print("[WARN] Upload process completed (check manually)")  # inconclusive
-
-                invoices_link = self.page.locator('nav a[href="/invoices"]').first  # locate invoices link
-                if invoices_link.is_visible():  # if visible
-                    invoices_link.click()  # click it
-                    self.page.wait_for_url("**/invoices", timeout=5000)  # wait for invoices page
-                    self.assertIn("invoices", self.page.url.lower())  # verify URL
-                    print("[OK] Navigation to invoices page works")  # log
-
-                dashboard_link = self.page.locator('nav a[href="/dashboard"]').first  # locate dashboard link
-                if dashboard_link.is_visible():  # if visible
-                    dashboard_link.click()  # click it
-                    self.page.wait_for_url("**/dashboard", timeout=5000)  # wait for dashboard
-                    self.assertIn("dashboard", self.page.url.lower())  # verify
-                    print("[OK] Navigation back to dashboard works")  # log
-
-            def test_login_with_invalid_credentials(self):  # test invalid login shows error
-                self.page.goto(f"{self.base_url}/login")  # go to login
-                self.page.fill('input[id="username"]', "wronguser")  # fill wrong username
-                self.page.fill('input[id="password"]', "wrongpass")  # fill wrong password
-                self.page.click('button[type="submit"]')  # submit
-
-                found = False  # flag for finding error message
-                try:
-                    self.page.wait_for_selector('text=Invalid credentials', timeout=3000)  # look for explicit text
-                    found = True
-                except Exception:
-                    try:
-                        self.page.wait_for_selector('[data-sonner-toast]', timeout=3000)  # fallback: any toast
-                        toast = self.page.locator('[data-sonner-toast]').first  # inspect first toast
-                        try:
-                            txt = toast.inner_text()  # read toast text
-                            if txt and ('invalid' in txt.lower() or 'error' in txt.lower()):
-                                found = True
-                        except Exception:
-                            found = True  # if reading text fails, assume toast present
-                    except Exception:
-                        found = False  # no toast found
-
-                if not found:  # save debug artifacts when not found
-                    debug_dir = os.path.join(os.path.dirname(__file__), 'fixtures', 'debug')  # debug dir path
-                    os.makedirs(debug_dir, exist_ok=True)  # ensure debug dir exists
-                    try:
-                        self.page.screenshot(path=os.path.join(debug_dir, 'invalid_login.png'), full_page=True)  # capture screenshot
-                    except Exception:
-                        pass  # ignore screenshot errors
-
-                if found and os.environ.get("SHOW_UI", "0") == "1":  # pause for visibility in headed mode
-                    print("SHOW_UI: observed error message — pausing 4s for inspection")
-                    time.sleep(4)
-
-                self.assertTrue(found, "Error message should appear for invalid credentials")  # assert error shown
-                self.assertIn("login", self.page.url.lower())  # ensure still on login page
-
-            def test_navigation_requires_authentication(self):  # protected routes redirect when not authenticated
-                self.page.goto(f"{self.base_url}/login")  # ensure starting at login
-                self.page.evaluate("localStorage.clear()")  # clear auth state
-                self.page.goto(f"{self.base_url}/upload")  # attempt to visit protected upload page
-                if os.environ.get("SHOW_UI", "0") == "1":  # optional pause for headed inspection
-                    print("SHOW_UI: pausing 6s to observe redirect")
-                    time.sleep(6)
-                self.page.wait_for_url("**/login", timeout=5000)  # expect redirect to login
-                self.assertIn("login", self.page.url.lower())  # verify redirect
-
-
-        if __name__ == "__main__":  # run tests when executed directly
-            unittest.main()  # invoke unittest test runner
+            print("[WARN] Upload process completed (check manually)")  # inconclusive
+
+        invoices_link = self.page.locator(NAV_INVOICES_LINK).first  # locate invoices link
+        if invoices_link.is_visible():  # if visible
+            self.page.click(f"{NAV_INVOICES_LINK} >> nth=0")  # single-shot click
+            self.page.wait_for_url("**/invoices")  # context default timeout applies
+            print("[OK] Navigation to invoices page works")  # log
+
+        dashboard_link = self.page.locator(NAV_DASHBOARD_LINK).first  # locate dashboard link
+        if dashboard_link.is_visible():  # if visible
+            self.page.click(f"{NAV_DASHBOARD_LINK} >> nth=0")  # single-shot click
+            self.page.wait_for_url("**/dashboard")  # context default timeout applies
+            print("[OK] Navigation back to dashboard works")  # log
+
+    def test_auth_and_guards(self):  # route guard + invalid login in one pooled context
+        # (a) Protected routes redirect when not authenticated; lands on the
+        # login page the second half of the test needs anyway, so the two
+        # checks share one setUp/tearDown and one navigation.
+        self.page.goto(f"{self.base_url}/upload")  # attempt to visit protected upload page; pool guarantees no auth state
+        self.page.wait_for_url("**/login")  # context default timeout applies
+
+        # (b) Invalid credentials show an error and stay on the login page.
+        self.page.fill(USERNAME_INPUT, "wronguser")  # fill wrong username
+        self.page.fill(PASSWORD_INPUT, "wrongpass")  # fill wrong password
+        self.page.click(SUBMIT_BUTTON)  # submit
+
+        # Race the explicit error text against the toast container in a
+        # single wait instead of two serial 3s polling passes.
+        error_locator = self.page.locator('text=Invalid credentials').or_(self.page.locator(TOAST))
+        try:
+            error_locator.first.wait_for(state="visible", timeout=3000)  # whichever matches first
+            found = True
+        except PlaywrightTimeoutError:
+            found = False  # neither the error text nor a toast appeared
+
+        if not found:  # save debug artifacts when not found
+            debug_dir = os.path.join(os.path.dirname(__file__), 'fixtures', 'debug')  # debug dir path
+            os.makedirs(debug_dir, exist_ok=True)  # ensure debug dir exists
+            try:
+                self.page.screenshot(path=os.path.join(debug_dir, 'invalid_login.png'))  # viewport-only is enough for debugging
+            except Exception:
+                pass  # ignore screenshot errors
+
+        if found and SHOW_UI:  # pause for visibility in headed mode
+            print("SHOW_UI: observed error message — waiting for the toast to dismiss")
+            try:
+                self.page.wait_for_function(
+                    "() => !document.querySelector('[data-sonner-toast]')",
+                    timeout=4000,
+                )  # returns the moment the toast disappears instead of a fixed 4s
+            except PlaywrightTimeoutError:
+                pass  # toast still up after 4s; proceed anyway
+
+        self.assertTrue(found, "Error message should appear for invalid credentials")  # assert error shown
+        self.assertIn("login", self.page.url.lower())  # ensure still on login page
+
+
+if __name__ == "__main__":  # run tests when executed directly
+    unittest.main()  # invoke unittest test runner